@@ -0,0 +1,116 @@
+"""
+Counts language model calls per simulated day made by Planning, comparing eager decomposition of the whole day,
+lazy decomposition and cached routine templates, separately and combined.
+
+A scripted language model stands in for a real one: it returns the same daily routine (with one seeded
+variation per day) and splits any block it is asked to decompose into even chunks, labelled after their parent.
+Each day the agent's plan is revised once by change_plan at a seeded time. The agent's plan is queried every
+5 minutes of the whole day, so lazy decomposition eventually expands every block it reaches; its savings come
+from blocks replaced by change_plan before the agent gets to them. Run from the repository root:
+
+    python -m benchmarks.planning_calls [--days 7]
+
+Author: Donny Sanders
+"""
+import argparse
+import json
+import random
+import re
+from core.language_model import LanguageModel
+from core.memory_stream import MemoryStream
+from core.planning import Planning
+from core.reflection import Reflection
+
+SEED = 1234
+
+ROUTINE = [
+    (7 * 60, 60, "wake up and have breakfast"),
+    (8 * 60, 240, "work at the cafe"),
+    (12 * 60, 60, "have lunch"),
+    (13 * 60, 240, "work at the cafe"),
+    (17 * 60, 120, "go for a walk in the park"),
+    (19 * 60, 120, "cook and eat dinner"),
+    (21 * 60, 120, "read a book"),
+]
+
+VARIATIONS = ["paint in the studio", "visit a friend", "go to the library", "practice guitar"]
+
+class ScriptedLanguageModel(LanguageModel):
+    """
+    Deterministic stand-in for a language model that follows the plan prompt formats.
+    """
+    TIME_RANGE = re.compile(r"Break down '(.+)' from (\d{2}):(\d{2}) to (\d{2}):(\d{2}) into (hour-long|5 to 15 minute)")
+
+    def __init__(self, rng):
+        super().__init__()
+        self.rng = rng
+
+    def complete(self, prompt):
+        match = self.TIME_RANGE.search(prompt)
+        if match is None:
+            # Day plan: the routine, with the evening slot varying from day to day
+            routine = ROUTINE[:-1] + [(21 * 60, 120, self.rng.choice(VARIATIONS))]
+            return "\n".join(f"{Planning.format_time(start)} {duration} {description}"
+                             for start, duration, description in routine)
+
+        parent = match.group(1)
+        start = int(match.group(2)) * 60 + int(match.group(3))
+        end = int(match.group(4)) * 60 + int(match.group(5))
+        step = 60 if match.group(6) == "hour-long" else 15
+        return "\n".join(f"{Planning.format_time(t)} {min(step, end - t)} {parent}, part {(t - start) // step + 1}"
+                         for t in range(start, end, step))
+
+def decompose_all(planning, nodes):
+    """
+    Decomposes every block of the plan up front, as an eager planner would.
+    """
+    for node in nodes:
+        if node.level in Planning.DECOMPOSITION_UNITS:
+            if node.children is None:
+                planning.decompose(node)
+            decompose_all(planning, node.children)
+
+def simulate(days, lazy, cache):
+    """
+    Simulates the given number of days, returning the language model calls made each day.
+    lazy: whether blocks are only decomposed when the agent reaches them, rather than the whole day up front.
+    cache: whether decompositions of recurring routines are reused.
+    """
+    rng = random.Random(SEED)
+    language_model = ScriptedLanguageModel(rng)
+    planning = Planning(language_model, cache_templates=cache)
+    reflection = Reflection()
+    memory_stream = MemoryStream()
+
+    calls = []
+    for _ in range(days):
+        before = language_model.calls
+        planning.create_plan(reflection, memory_stream)
+        if not lazy:
+            decompose_all(planning, planning.action_plans)
+
+        change_time = rng.randrange(9 * 60, 18 * 60, 15)
+        for time in range(0, 24 * 60, 5):
+            if time == change_time:
+                planning.change_plan({"description": "help a neighbour move", "start": time, "duration": 90})
+                if not lazy:
+                    decompose_all(planning, planning.action_plans)
+            planning.implement_plan(time)
+
+        calls.append(language_model.calls - before)
+    return calls
+
+def main():
+    parser = argparse.ArgumentParser(description="Count planning language model calls per simulated day.")
+    parser.add_argument("--days", type=int, default=7, help="number of days to simulate")
+    args = parser.parse_args()
+
+    report = {"seed": SEED}
+    for name, lazy, cache in [("eager", False, False), ("lazy", True, False),
+                              ("eager_cached", False, True), ("lazy_cached", True, True)]:
+        calls = simulate(args.days, lazy, cache)
+        report[name] = {"calls_per_day": calls, "mean": sum(calls) / len(calls)}
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    main()
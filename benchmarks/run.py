@@ -0,0 +1,291 @@
+"""
+Benchmark suite covering the simulation's hot paths.
+
+Runs headless with a fixed seed, prints the results as JSON and compares them against a stored baseline,
+exiting with a non-zero status if any benchmark is slower than the baseline by more than the tolerance.
+Run from the repository root:
+
+    python -m benchmarks.run [--output results.json] [--update-baseline] [--rebaseline NAME ...] [--tolerance 0.5]
+
+--update-baseline only adds benchmarks missing from the baseline, so existing entries keep the values they were
+first recorded with. Use --rebaseline for entries whose benchmark deliberately changed.
+
+Author: Donny Sanders
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Must be set before pygame is imported so no window is opened and stdout only carries the JSON report.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from core.agent import Agent
+from core.memory_stream import MemoryStream
+from environment.grid import Grid, Tile
+from environment.location_index import LocationIndex
+from environment.object import Object
+from environment.simulation import Simulation
+from util.cooperative_pathfinder import CooperativePathfinder
+from util.json_parser import JsonParser
+from util.pathfinder import Pathfinder
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SEED = 1234
+SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900
+
+def bench_rng(name):
+    """
+    Returns the random generator for the named benchmark. Each benchmark gets its own generator,
+    so adding a benchmark doesn't change the inputs (and baselines) of the others.
+    """
+    return random.Random(f"{SEED}:{name}")
+
+def measure(func, repeat, number=1):
+    """
+    Times func, returning the median and minimum seconds per call over repeat rounds of number calls.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+def generate_map(width, height, rng, obstacle_ratio=0.25):
+    """
+    Generates a 2D array (rows of tile types) where 1 is a dirt path and 0 is grass.
+    A fraction of the tiles are marked as obstacles and returned separately.
+    """
+    raw_grid = [[rng.randint(0, 1) for _ in range(width)] for _ in range(height)]
+    obstacles = {(x, y) for x in range(width) for y in range(height) if rng.random() < obstacle_ratio}
+    return raw_grid, obstacles
+
+def build_grid(width, height, rng):
+    """
+    Builds a Grid in board coordinates (grid[x][y]) with randomly placed unwalkable tiles.
+    """
+    raw_grid, obstacles = generate_map(width, height, rng)
+    grid = Grid(1, width, height)
+    grid.grid = [[Tile(x, y, raw_grid[y][x], (x, y) not in obstacles) for y in range(height)] for x in range(width)]
+    return grid
+
+def bench_pathfinder(rng):
+    """
+    Pathfinder.find_path between random walkable tiles on generated maps.
+    """
+    results = {}
+    for width, height in [(32, 32), (64, 64)]:
+        grid = build_grid(width, height, rng)
+        pathfinder = Pathfinder(grid)
+        walkable = [(x, y) for x in range(width) for y in range(height) if grid.get(x, y).walkable]
+        queries = [(rng.choice(walkable), rng.choice(walkable)) for _ in range(20)]
+
+        def run():
+            for start, end in queries:
+                pathfinder.find_path(start, end)
+
+        results[f"pathfinder.find_path.{width}x{height}"] = measure(run, repeat=5)
+    return results
+
+def bench_cooperative_pathfinder(rng):
+    """
+    CooperativePathfinder.plan_batch with many agents converging on a shared goal.
+    """
+    results = {}
+    grid = build_grid(64, 64, rng)
+    walkable = [(x, y) for x in range(64) for y in range(64) if grid.get(x, y).walkable]
+    goal = rng.choice(walkable)
+    for count in [10, 50]:
+        requests = {i: (start, goal) for i, start in enumerate(rng.sample(walkable, count))}
+        planner = CooperativePathfinder(grid)
+
+        results[f"cooperative_pathfinder.plan_batch.{count}_agents"] = measure(
+            lambda: planner.plan_batch(requests), repeat=5)
+    return results
+
+def bench_load_grid(rng):
+    """
+    JsonParser.loadGrid on generated map files of several sizes.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in [(16, 9), (64, 36), (128, 72)]:
+            path = os.path.join(directory, f"grid_{width}x{height}.json")
+            raw_grid, _ = generate_map(width, height, rng)
+            with open(path, 'w') as f:
+                json.dump(raw_grid, f)
+
+            results[f"json_parser.loadGrid.{width}x{height}"] = measure(
+                lambda: JsonParser.loadGrid(100, SCREEN_WIDTH, SCREEN_HEIGHT, path), repeat=3)
+    return results
+
+def bench_draw(rng, screen):
+    """
+    Grid.draw plus drawing every agent, i.e. one rendered frame.
+    """
+    results = {}
+    grid = JsonParser.loadGrid(100, SCREEN_WIDTH, SCREEN_HEIGHT)
+    for count in [10, 100]:
+        agents = [Agent(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT), "Roberto Filipe", grid)
+                  for _ in range(count)]
+
+        def run():
+            grid.draw(screen)
+            for agent in agents:
+                agent.draw(screen, grid.grid_size, 0.5)
+
+        results[f"frame.draw.{count}_agents"] = measure(run, repeat=5, number=5)
+    return results
+
+def bench_memory_retrieval(rng):
+    """
+    MemoryStream.retrieve_experience at varied memory counts.
+    """
+    words = ["coffee", "cafe", "party", "library", "music", "paint", "garden", "breakfast", "dinner",
+             "friend", "work", "election", "book", "park", "talk", "walk", "sleep", "study"]
+    now = time.time()
+    results = {}
+    for count in [100, 1000, 10000]:
+        memory_stream = MemoryStream()
+        for _ in range(count):
+            memory_stream.store_experience({
+                "description": " ".join(rng.choice(words) for _ in range(8)),
+                "created": now - rng.uniform(0, 72 * 3600),
+                "importance": rng.randint(1, 10),
+            })
+
+        results[f"memory_stream.retrieve_experience.{count}"] = measure(
+            lambda: memory_stream.retrieve_experience("planning a party at the cafe with a friend", now=now),
+            repeat=5)
+    return results
+
+def bench_location_index(rng):
+    """
+    LocationIndex.nearest for the 5 closest objects of a type at varied object counts.
+    """
+    types = ["bed", "stove", "table", "desk", "counter"]
+    results = {}
+    for count in [100, 10000]:
+        objects = [Object(rng.randrange(256), rng.randrange(256), None, f"object {i}", rng.choice(types),
+                          (f"area {i % 10}", f"room {i % 50}")) for i in range(count)]
+        index = LocationIndex(objects)
+        queries = [(rng.randrange(256), rng.randrange(256)) for _ in range(100)]
+
+        def run():
+            for position in queries:
+                index.nearest(position, "stove", 5)
+
+        results[f"location_index.nearest.{count}"] = measure(run, repeat=5)
+    return results
+
+def bench_ticks(rng, screen):
+    """
+    End-to-end headless Simulation.step (events, one tick of every agent walking and animating, drawing the
+    grid and agents, flip) with varied agent counts.
+    """
+    results = {}
+    for count in [10, 100, 1000]:
+        simulation = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT, screen)
+        for _ in range(count - len(simulation.agents)):
+            agent = Agent(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT), "Roberto Filipe", simulation.grid)
+            simulation.agents.append(agent)
+            simulation.drawables.append(agent)
+            agent.move(rng.choice([-1, 1]), 0)
+
+        # Each step is fed exactly one tick's worth of time, so it runs one tick and draws one frame
+        result = measure(lambda: simulation.step(simulation.tick_time), repeat=5, number=5)
+        result["ticks_per_second"] = 1 / result["median"] if result["median"] > 0 else float("inf")
+        results[f"simulation.step.{count}_agents"] = result
+    return results
+
+def run_benchmarks():
+    """
+    Runs every benchmark and returns a dictionary mapping benchmark names to their timings.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {}
+    results.update(bench_pathfinder(bench_rng("pathfinder")))
+    results.update(bench_cooperative_pathfinder(bench_rng("cooperative_pathfinder")))
+    results.update(bench_load_grid(bench_rng("load_grid")))
+    results.update(bench_draw(bench_rng("draw"), screen))
+    results.update(bench_memory_retrieval(bench_rng("memory_retrieval")))
+    results.update(bench_location_index(bench_rng("location_index")))
+    results.update(bench_ticks(bench_rng("ticks"), screen))
+
+    pygame.quit()
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a list of (name, baseline, current) for benchmarks whose best time is slower than the baseline
+    by more than the given tolerance (fraction). The minimum is compared as it is the least sensitive to noise.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]["min"]
+        if result["min"] > expected * (1 + tolerance):
+            regressions.append((name, expected, result["min"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the simulation benchmark suite.")
+    parser.add_argument("--output", help="file to write the JSON results to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="add benchmarks missing from the baseline")
+    parser.add_argument("--rebaseline", nargs="+", default=[], metavar="NAME",
+                        help="overwrite the named baseline entries with these results")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks()
+    report = {"seed": SEED, "python": sys.version.split()[0], "pygame": pygame.version.ver, "results": results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+    print(json.dumps(report, indent=4))
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    if args.update_baseline or args.rebaseline:
+        unknown = [name for name in args.rebaseline if name not in results]
+        if unknown:
+            print(f"Unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+
+        for name, result in results.items():
+            if name in args.rebaseline or (args.update_baseline and name not in baseline):
+                baseline[name] = result
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=4)
+        return 0
+
+    if not baseline:
+        print("No baseline found, skipping comparison.", file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, expected, actual in regressions:
+        print(f"REGRESSION {name}: {expected * 1000:.3f} ms -> {actual * 1000:.3f} ms", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,10 +11,10 @@ import os
 import time
 import pygame
 from heapq import heappop, heappush
-from agents.agent_state import IdleState
-from agents.memory_stream import MemoryStream
-from agents.planning import Planning
-from agents.reflection import Reflection
+from core.agent_state import IdleState, WalkingState
+from core.memory_stream import MemoryStream
+from core.planning import Planning
+from core.reflection import Reflection
 from environment.grid import Grid
 from util.pathfinder import Pathfinder
 
@@ -35,6 +35,10 @@ class Agent:
         self.screen_x = x
         self.screen_y = y
 
+        # Position at the previous simulation tick, used to interpolate between ticks when drawing
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         self.name = name
 
         self.memory_stream = MemoryStream()
@@ -43,7 +47,8 @@ class Agent:
         self.state = IdleState()
 
         self.can_move = True
-        self.speed = 50.0
+        self.speed = 3.0  # tiles per second
+        self.velocity = (0, 0)
 
         self.direction = "down"
         
@@ -54,13 +59,13 @@ class Agent:
 
     def move(self, dx, dy):
         """
-        Move agent in the environment.
+        Sets the direction the agent walks in. The position is advanced by update().
+        - dx, dy: -1, 0 or 1 along each axis. Diagonal movement is not allowed; (0, 0) stops the agent.
         """
         if not self.can_move or (dx != 0 and dy != 0):
             return
         
-        self.x += dx
-        self.y += dy
+        self.velocity = (dx, dy)
 
         # Set direction based on movement
         if dx > 0:
@@ -72,13 +77,35 @@ class Agent:
         elif dy < 0:
             self.direction = "up"
 
-    def draw(self, window, grid_size):
+    def update(self, dt):
+        """
+        Advances the agent by one simulation tick.
+        - dt: length of the tick in seconds.
+        """
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+        dx, dy = self.velocity
+        moving = self.can_move and (dx != 0 or dy != 0)
+        if moving:
+            self.x += dx * self.speed * dt
+            self.y += dy * self.speed * dt
+
+        if moving and isinstance(self.state, IdleState):
+            self.change_state(WalkingState())
+        elif not moving and not isinstance(self.state, IdleState):
+            self.change_state(IdleState())
+
+    def draw(self, window, grid_size, alpha=1.0):
         """
         Draw agent in the provided window.
         - window: pygame window object where the agent needs to be drawn.
         - grid_size: size of each grid cell.
+        - alpha: fraction of the way from the previous simulation tick to the current one.
         """
-        screen_x, screen_y = Grid.board_to_screen(self.x, self.y, grid_size)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        screen_x, screen_y = Grid.board_to_screen(x, y, grid_size)
 
         direction_index = {
             'down': 0,
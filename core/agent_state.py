@@ -9,18 +9,26 @@ class AgentState(ABC):
     """
     Abstract base class for all agent states.
     """
-    def __init__(self, num_frames):
+    def __init__(self, num_frames, frame_duration):
+        """
+        num_frames: number of animation frames in the state's sprite row.
+        frame_duration: seconds each animation frame is shown.
+        """
         self.num_frames = num_frames
+        self.frame_duration = frame_duration
+        self.elapsed = 0.0
         self.current_frame = 0
 
     @abstractmethod
-    def enter(self):
+    def enter(self, agent):
+        self.elapsed = 0.0
         self.current_frame = 0
 
     @abstractmethod
-    def execute(self, agent):
-        # Cycle through frames
-        self.current_frame = (self.current_frame + 1) % self.num_frames
+    def execute(self, agent, dt):
+        # Select the frame from the time spent in this state, so animation speed is independent of the tick rate
+        self.elapsed += dt
+        self.current_frame = int(self.elapsed / self.frame_duration) % self.num_frames
 
     @abstractmethod
     def exit(self, agent):
@@ -35,12 +43,12 @@ class IdleState(AgentState):
     The agent is currently idle.
     """
     def __init__(self):
-        super().__init__(num_frames=1)
+        super().__init__(num_frames=1, frame_duration=1.0)
 
-    def enter(self):
+    def enter(self, agent):
         pass
 
-    def execute(self, agent):
+    def execute(self, agent, dt):
         pass
 
     def exit(self, agent):
@@ -54,13 +62,13 @@ class WalkingState(AgentState):
     The agent is currently walking.
     """
     def __init__(self):
-        super().__init__(num_frames=8)
+        super().__init__(num_frames=8, frame_duration=0.1)
 
-    def enter(self):
-        super().enter()
+    def enter(self, agent):
+        super().enter(agent)
 
-    def execute(self, agent):
-        super.execute(agent)
+    def execute(self, agent, dt):
+        super().execute(agent, dt)
 
     def exit(self, agent):
         pass
@@ -73,16 +81,16 @@ class RunningState(AgentState):
     The agent is currently running.
     """
     def __init__(self):
-        super().__init__(num_frames=20)
+        super().__init__(num_frames=20, frame_duration=0.05)
 
-    def enter(self):
-        super().enter()
+    def enter(self, agent):
+        super().enter(agent)
 
-    def execute(self, agent):
+    def execute(self, agent, dt):
         pass
 
     def exit(self, agent):
         pass
 
     def handle_event(self, agent, event):
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,177 @@
+"""
+Module containing the Conversation and ConversationScheduler classes, which manage dialogue between agents.
+Each conversation is a session holding the transcript and every participant's retrieved memories. The memories
+are retrieved from the full memory stream once when the conversation starts; after that, each turn only rescores
+the cached memories together with experiences stored since the last turn. The scheduler generates the next
+utterance of every active conversation with a single batched language model call per tick.
+
+This module is based on the methods described in:
+
+Park, J. S., O'Brien, J. C., Cai, C. J., Morris, M. R., Liang, P., & Bernstein, M. S. (2023). Generative Agents: Interactive Simulacra of Human Behavior.
+[https://arxiv.org/abs/2304.03442]
+
+Author: Donny Sanders
+"""
+import time
+from util.profiler import profiler
+
+class ConversationContext:
+    """
+    A participant's cached memories for the duration of a conversation.
+    """
+    def __init__(self, memories, next_id):
+        """
+        memories: the retrieved experiences.
+        next_id: id of the first experience stored after the memories were retrieved.
+        """
+        self.memories = memories
+        self.next_id = next_id
+
+class Conversation:
+    """
+    A dialogue session between two or more agents.
+    """
+    def __init__(self, participants, topic, max_turns=8):
+        """
+        Initializes the conversation.
+        participants: the agents taking part, in speaking order.
+        topic: what the conversation is about.
+        max_turns: number of utterances after which the conversation ends.
+        """
+        assert len(participants) >= 2, "A conversation needs at least two participants."
+
+        self.participants = list(participants)
+        self.topic = topic
+        self.max_turns = max_turns
+        self.utterances = []
+        # agent -> ConversationContext, keyed by the agent itself as names need not be unique
+        self.contexts = {}
+        self.active = True
+
+    def next_speaker(self):
+        """
+        Returns the agent whose turn it is to speak.
+        """
+        return self.participants[len(self.utterances) % len(self.participants)]
+
+    def setting(self, agent):
+        """
+        Describes who the agent is talking with and about what.
+        """
+        others = ", ".join(p.name for p in self.participants if p is not agent)
+        return f"{agent.name} is talking with {others} about {self.topic}."
+
+    def situation(self, agent):
+        """
+        Describes the conversation from the agent's point of view, used as the memory retrieval query.
+        """
+        situation = self.setting(agent)
+        if self.utterances:
+            speaker, text = self.utterances[-1]
+            situation += f" {speaker} said: {text}"
+        return situation
+
+    def refresh_context(self, agent, count, now):
+        """
+        Updates the agent's cached memories for the current turn and returns them.
+        The first call retrieves from the whole memory stream; later calls only rescore the cached memories
+        and experiences stored since the previous call.
+        """
+        memory_stream = agent.memory_stream
+        context = self.contexts.get(agent)
+
+        if context is None:
+            memories = memory_stream.retrieve_experience(self.situation(agent), count, now)
+        else:
+            candidates = context.memories + memory_stream.experiences_since(context.next_id)
+            memories = memory_stream.retrieve_experience(self.situation(agent), count, now, candidates)
+
+        self.contexts[agent] = ConversationContext(memories, memory_stream.next_id)
+        return memories
+
+    def prompt(self, agent, memories):
+        """
+        Builds the prompt asking the language model for the agent's next utterance.
+        """
+        lines = [self.setting(agent)]
+        lines.append(f"Relevant memories of {agent.name}:")
+        lines.extend(f"- {memory['description']}" for memory in memories)
+        lines.append("Conversation so far:")
+        lines.extend(f"{speaker}: {text}" for speaker, text in self.utterances)
+        lines.append(f"What would {agent.name} say next? Reply with an empty line to end the conversation.")
+        return "\n".join(lines)
+
+    def add_utterance(self, agent, text):
+        """
+        Appends the agent's utterance to the transcript, ending the conversation if the reply is empty
+        or the turn limit is reached.
+        """
+        text = text.strip()
+        if text:
+            self.utterances.append((agent.name, text))
+        if not text or len(self.utterances) >= self.max_turns:
+            self.active = False
+
+class ConversationScheduler:
+    """
+    Runs all active conversations, generating one utterance per conversation each tick.
+    """
+    def __init__(self, language_model, context_size=10):
+        """
+        Initializes the scheduler.
+        language_model: LanguageModel used to generate utterances.
+        context_size: number of memories retrieved for each participant.
+        """
+        self.language_model = language_model
+        self.context_size = context_size
+        self.conversations = []
+
+    def start_conversation(self, participants, topic, max_turns=8):
+        """
+        Starts a conversation between the given agents and returns it.
+        """
+        conversation = Conversation(participants, topic, max_turns)
+        self.conversations.append(conversation)
+        return conversation
+
+    def end_conversation(self, conversation, now=None):
+        """
+        Ends the conversation and stores it in each participant's memory stream.
+        """
+        if now is None:
+            now = time.time()
+
+        conversation.active = False
+        if conversation in self.conversations:
+            self.conversations.remove(conversation)
+
+        for agent in conversation.participants:
+            others = ", ".join(p.name for p in conversation.participants if p is not agent)
+            agent.memory_stream.store_experience({
+                "description": f"{agent.name} talked with {others} about {conversation.topic}.",
+                "created": now,
+            })
+
+    def tick(self, now=None):
+        """
+        Generates the next utterance of every active conversation in a single batched language model call,
+        and ends conversations that are finished.
+        """
+        if now is None:
+            now = time.time()
+
+        with profiler.span("conversation.tick", conversations=len(self.conversations)):
+            speakers = []
+            prompts = []
+            for conversation in self.conversations:
+                speaker = conversation.next_speaker()
+                memories = conversation.refresh_context(speaker, self.context_size, now)
+                speakers.append(speaker)
+                prompts.append(conversation.prompt(speaker, memories))
+
+            replies = self.language_model.generate_batch(prompts)
+
+            for conversation, speaker, reply in zip(list(self.conversations), speakers, replies):
+                conversation.add_utterance(speaker, reply)
+                if not conversation.active:
+                    self.end_conversation(conversation, now)
@@ -0,0 +1,93 @@
+"""
+Module containing the LanguageModel base class, the interface cognition modules use to query a large language model.
+Backends subclass it and implement complete(); batching and instrumentation are handled here.
+
+Author: Donny Sanders
+"""
+import time
+from abc import ABC, abstractmethod
+from util.profiler import profiler
+
+class LanguageModel(ABC):
+    """
+    Abstract base class for language model backends.
+    """
+
+    # Whether complete_batch sends all prompts in a single request. Backends that override complete_batch
+    # with a real batched request should set this, so calls counts requests correctly.
+    BATCHED = False
+
+    def __init__(self):
+        """
+        Initializes the counters.
+        calls: requests sent to the backend.
+        batches: calls to generate() and generate_batch().
+        prompts: prompts completed.
+        """
+        self.calls = 0
+        self.batches = 0
+        self.prompts = 0
+
+    @abstractmethod
+    def complete(self, prompt):
+        """
+        Returns the model's completion for a single prompt. Must be implemented by backends.
+
+        Args:
+            prompt (str): the prompt to complete.
+        """
+        pass
+
+    def complete_batch(self, prompts):
+        """
+        Returns the model's completions for several prompts. Backends that support batched requests should
+        override this and set BATCHED; by default the prompts are completed one request at a time.
+
+        Args:
+            prompts (list): the prompts to complete.
+        """
+        return [self.complete(prompt) for prompt in prompts]
+
+    def count_tokens(self, text):
+        """
+        Returns the number of tokens in the text. Backends with a tokenizer should override this estimate.
+        """
+        return len(text.split())
+
+    def generate(self, prompt):
+        """
+        Completes a single prompt, recording the call.
+
+        Args:
+            prompt (str): the prompt to complete.
+
+        Returns:
+            The completion text.
+        """
+        return self.generate_batch([prompt])[0]
+
+    def generate_batch(self, prompts):
+        """
+        Completes several prompts in one call to the backend, recording the call.
+
+        Args:
+            prompts (list): the prompts to complete.
+
+        Returns:
+            A list of completion texts, in the same order as the prompts.
+        """
+        if not prompts:
+            return []
+
+        start = time.perf_counter()
+        completions = self.complete_batch(prompts)
+        latency = time.perf_counter() - start
+
+        self.calls += 1 if self.BATCHED else len(prompts)
+        self.batches += 1
+        self.prompts += len(prompts)
+        if profiler.enabled:
+            profiler.record_llm_call(latency,
+                                     sum(self.count_tokens(prompt) for prompt in prompts),
+                                     sum(self.count_tokens(completion) for completion in completions))
+        return completions
@@ -11,13 +11,25 @@ Park, J. S., O'Brien, J. C., Cai, C. J., Morris, M. R., Liang, P., & Bernstein,
 
 Author: Donny Sanders
 """
+import re
+import time
+from util.profiler import profiler
+
 class MemoryStream:
+
+    # Recency decays exponentially over the hours since a memory was last accessed.
+    RECENCY_DECAY = 0.995
+
+    # Importance scores assigned by the language model range from 1 (mundane) to 10 (poignant).
+    DEFAULT_IMPORTANCE = 1
+
     def __init__(self):
         """
         Initializes an empty list to store experiences of an agent. Each experience is a dictionary with a 
         description, creation timestamp, and a recent access timestamp.
         """
         self.experiences = []
+        self.next_id = 0
 
     def store_experience(self, experience):
         """
@@ -26,21 +38,74 @@ class MemoryStream:
 
         Args:
             experience (dict): a dictionary representing an experience.
+
+        Returns:
+            The id assigned to the experience.
         """
-        pass
+        now = time.time()
+        experience.setdefault("created", now)
+        experience.setdefault("last_accessed", experience["created"])
+        experience.setdefault("importance", self.DEFAULT_IMPORTANCE)
+        experience["id"] = self.next_id
+        experience["keywords"] = self.keywords(experience["description"])
+        self.next_id += 1
+
+        self.experiences.append(experience)
+        return experience["id"]
 
-    def retrieve_experience(self, current_situation):
+    def retrieve_experience(self, current_situation, count=10, now=None, candidates=None):
         """
         Retrieves a subset of experiences based on the current situation of the agent. The function uses 
         relevance, recency, and importance of each experience to decide which ones to retrieve.
+        Relevance is the keyword overlap between the experience and the situation.
 
         Args:
             current_situation (str): the current situation of the agent.
+            count (int): the maximum number of experiences to retrieve.
+            now (float): the current timestamp, defaults to the wall clock.
+            candidates (list): the experiences to score, defaults to the whole memory stream.
 
         Returns:
-            A subset of the memory stream.
+            A subset of the memory stream, ordered from highest to lowest score.
         """
-        pass
+        if candidates is None:
+            candidates = self.experiences
+
+        with profiler.span("memory.retrieve", candidates=len(candidates)):
+            if now is None:
+                now = time.time()
+            profiler.record("memory.candidates_scored", len(candidates))
+
+            if not candidates:
+                return []
+
+            query = self.keywords(current_situation)
+            recency = [self.RECENCY_DECAY ** ((now - e["last_accessed"]) / 3600) for e in candidates]
+            importance = [e["importance"] for e in candidates]
+            relevance = [len(query & e["keywords"]) / (len(query | e["keywords"]) or 1) for e in candidates]
+
+            recency = self.normalize(recency)
+            importance = self.normalize(importance)
+            relevance = self.normalize(relevance)
+
+            scores = [recency[i] + importance[i] + relevance[i] for i in range(len(candidates))]
+            ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)[:count]
+
+            retrieved = [candidates[i] for i in ranked]
+            for experience in retrieved:
+                experience["last_accessed"] = now
+
+            return retrieved
+
+    def experiences_since(self, experience_id):
+        """
+        Returns the experiences stored after the given id, i.e. everything with an id >= experience_id.
+
+        Args:
+            experience_id (int): the id of the first experience to return.
+        """
+        # Experiences are never removed, so ids double as indices into the stream.
+        return self.experiences[experience_id:]
 
     def update_importance(self, experience_id, score):
         """
@@ -50,4 +115,27 @@ class MemoryStream:
             experience_id (int): the id of the experience.
             score (int): the importance score assigned by the language model.
         """
-        pass
\ No newline at end of file
+        # Experiences are never removed, so ids double as indices into the stream.
+        if not 0 <= experience_id < len(self.experiences):
+            raise KeyError(f"No experience with id {experience_id}")
+
+        self.experiences[experience_id]["importance"] = score
+
+    # Utility methods
+
+    @staticmethod
+    def keywords(text):
+        """
+        Returns the set of lowercase words in the given text.
+        """
+        return set(re.findall(r"[a-z0-9']+", text.lower()))
+
+    @staticmethod
+    def normalize(values):
+        """
+        Min-max normalizes a list of scores to the range [0, 1].
+        """
+        low, high = min(values), max(values)
+        if high == low:
+            return [0.0 for _ in values]
+        return [(v - low) / (high - low) for v in values]
@@ -1,5 +1,9 @@
 """
 Module containing the Planning class.
+A day's plan is a tree: broad strokes for the day, decomposed into hour-long chunks, then into 5-15 minute actions.
+Decomposition is lazy, so only the block the agent is currently in is expanded, and decompositions of recurring
+routines are cached as templates so later days reuse them without asking the language model again.
+
 This module is based on the methods described in:
 
 Park, J. S., O'Brien, J. C., Cai, C. J., Morris, M. R., Liang, P., & Bernstein, M. S. (2023). Generative Agents: Interactive Simulacra of Human Behavior.
@@ -7,35 +11,211 @@ Park, J. S., O'Brien, J. C., Cai, C. J., Morris, M. R., Liang, P., & Bernstein,
 
 Author: Donny Sanders
 """
+import re
+
+class PlanNode:
+    """
+    A block of the plan. Times are in minutes since the start of the day.
+    """
+    def __init__(self, description, start, duration, level, parent_routine=()):
+        """
+        description: what the agent does during the block.
+        start, duration: when the block starts and how long it lasts, in minutes.
+        level: depth in the plan (0 = broad stroke, 1 = hour-long chunk, 2 = action).
+        parent_routine: routine of the enclosing block, empty for broad strokes.
+        """
+        self.description = description
+        self.start = start
+        self.duration = duration
+        self.level = level
+        self.children = None  # None until the block is decomposed
+
+        # For a block trimmed out of a longer undecomposed one, (template key, start) of the original block,
+        # so it is decomposed by cutting the original block's template down to this block's interval
+        self.template = None
+
+        # Descriptions from the broad stroke down to this block, e.g. ("work at the cafe", "serve customers")
+        self.routine = tuple(parent_routine) + (description.lower(),)
+
+    @property
+    def end(self):
+        return self.start + self.duration
+
+    def contains(self, time):
+        return self.start <= time < self.end
+
 class Planning:
-    def __init__(self):
+
+    # Granularity the language model is asked for when decomposing a block of the given level
+    DECOMPOSITION_UNITS = {0: "hour-long chunks", 1: "5 to 15 minute actions"}
+
+    # Matches a plan line of the form "HH:MM <duration in minutes> <description>"
+    PLAN_LINE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s+(\d+)\s+(.+?)\s*$")
+
+    def __init__(self, language_model=None, cache_templates=True):
         """
         Initializes an empty list to store action plans.
+
+        Args:
+            language_model (LanguageModel): the model used to create and decompose plans.
+            cache_templates (bool): whether decompositions of recurring routines are reused across days.
         """
         self.action_plans = []
+        self.language_model = language_model
+        self.cache_templates = cache_templates
+
+        # (routine, duration) -> [(offset, duration, description)] of the block's children. The key includes
+        # the enclosing blocks' descriptions, so a generic chunk like "step 1" is only reused within the same routine.
+        self.templates = {}
 
     def create_plan(self, reflection, memory_stream):
         """
-        Creates high-level action plans based on the conclusions drawn from reflection and the current 
+        Creates high-level action plans based on the conclusions drawn from reflection and the current
         environment. Each plan includes a location, a starting time, and a duration.
+        Only the day's broad strokes are created; they are decomposed lazily by implement_plan().
 
         Args:
             reflection (Reflection): an instance of the Reflection class.
             memory_stream (MemoryStream): an instance of the MemoryStream class.
         """
-        pass
+        memories = memory_stream.retrieve_experience("plans for today")
+        prompt = "\n".join(
+            ["Conclusions:"] + [f"- {conclusion}" for conclusion in reflection.conclusions] +
+            ["Relevant memories:"] + [f"- {memory['description']}" for memory in memories] +
+            ["Outline today's plan in 5 to 8 broad strokes, one per line as 'HH:MM <duration in minutes> <description>'."])
 
-    def implement_plan(self):
+        self.action_plans = self.parse_plan(self.language_model.generate(prompt), 0, 24 * 60, 0, "free time")
+
+    def implement_plan(self, time):
         """
         Converts the high-level action plans into detailed behaviors for action and reaction.
+        Only the blocks containing the given time are decomposed.
+
+        Args:
+            time (int): minutes since the start of the day.
+
+        Returns:
+            The most detailed PlanNode covering the time, or None if nothing is planned.
+        """
+        nodes = self.action_plans
+        current = None
+        while nodes is not None:
+            node = next((node for node in nodes if node.contains(time)), None)
+            if node is None:
+                break
+            if node.level in self.DECOMPOSITION_UNITS and node.children is None:
+                self.decompose(node)
+            current = node
+            nodes = node.children
+
+        return current
+
+    def decompose(self, node):
+        """
+        Decomposes a block into finer-grained children, reusing a cached template for the same routine if one exists.
+        A block trimmed out of a longer one gets the original block's template, cut to its own interval.
+
+        Args:
+            node (PlanNode): the block to decompose.
         """
-        pass
+        if self.cache_templates and node.template is not None:
+            key, origin = node.template
+        else:
+            key, origin = (node.routine, node.duration), node.start
+        template = self.templates.get(key) if self.cache_templates else None
+
+        if template is None:
+            start, end = origin, origin + key[1]
+            prompt = (f"Break down '{node.description}' from {self.format_time(start)} to {self.format_time(end)} "
+                      f"into {self.DECOMPOSITION_UNITS[node.level]}, one per line as 'HH:MM <duration in minutes> <description>'.")
+            children = self.parse_plan(self.language_model.generate(prompt), start, end, node.level + 1,
+                                       node.description)
+            template = [(child.start - start, child.duration, child.description) for child in children]
+            if self.cache_templates:
+                self.templates[key] = template
+
+        node.children = []
+        for offset, duration, description in template:
+            child_start = max(origin + offset, node.start)
+            child_end = min(origin + offset + duration, node.end)
+            if child_start >= child_end:
+                continue
+
+            child = PlanNode(description, child_start, child_end - child_start, node.level + 1, node.routine)
+            if child.duration < duration:
+                child.template = ((child.routine, duration), origin + offset)
+            node.children.append(child)
 
     def change_plan(self, new_plan):
         """
         Changes the current plan midstream if needed.
+        Blocks overlapping the new plan are trimmed (or removed if fully covered), keeping the decomposition
+        of whatever remains, and the new plan is inserted undecomposed.
 
         Args:
-            new_plan (dict): a new plan to replace the current one.
+            new_plan (dict): a new plan to replace the current one, with a description, start and duration.
+        """
+        start = new_plan["start"]
+        end = start + new_plan["duration"]
+
+        remaining = []
+        for node in self.action_plans:
+            remaining.extend(self.trim(node, start, end))
+        remaining.append(PlanNode(new_plan["description"], start, new_plan["duration"], 0))
+
+        self.action_plans = sorted(remaining, key=lambda node: node.start)
+
+    def trim(self, node, start, end):
+        """
+        Returns the parts of the node outside of the interval [start, end), with their children trimmed likewise.
+        """
+        if node.end <= start or node.start >= end:
+            return [node]
+
+        pieces = []
+        for piece_start, piece_end in [(node.start, start), (end, node.end)]:
+            if piece_start >= piece_end:
+                continue
+
+            piece = PlanNode(node.description, piece_start, piece_end - piece_start, node.level, node.routine[:-1])
+            if node.children is None:
+                piece.template = node.template or ((node.routine, node.duration), node.start)
+            else:
+                piece.children = [trimmed for child in node.children for trimmed in self.trim(child, start, end)
+                                  if piece_start <= trimmed.start and trimmed.end <= piece_end]
+            pieces.append(piece)
+
+        return pieces
+
+    # Utility methods
+
+    @staticmethod
+    def parse_plan(text, start, end, level, fallback):
+        """
+        Parses the language model's plan lines into PlanNodes clamped to [start, end), ordered by start time.
+        If nothing can be parsed, the whole interval becomes a single node described by fallback,
+        so decomposition still terminates.
+        """
+        nodes = []
+        for line in text.splitlines():
+            match = Planning.PLAN_LINE.match(line)
+            if match is None:
+                continue
+
+            hours, minutes, duration, description = match.groups()
+            node_start = max(start, int(hours) * 60 + int(minutes))
+            node_end = min(end, node_start + int(duration))
+            if node_start < node_end:
+                nodes.append(PlanNode(description, node_start, node_end - node_start, level))
+
+        if not nodes:
+            nodes.append(PlanNode(fallback, start, end - start, level))
+
+        return sorted(nodes, key=lambda node: node.start)
+
+    @staticmethod
+    def format_time(minutes):
+        """
+        Formats minutes since the start of the day as HH:MM.
         """
-        pass
\ No newline at end of file
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
@@ -0,0 +1,148 @@
+"""
+Module containing the LocationIndex class, which answers environment queries about objects and locations.
+Locations form a tree (area -> room -> object), as in the environment tree of the paper, with name lookups.
+Objects are also bucketed by type in a coarse spatial hash, so finding the nearest objects of a type only
+inspects the occupied buckets nearest the query position instead of every object.
+
+Park, J. S., O'Brien, J. C., Cai, C. J., Morris, M. R., Liang, P., & Bernstein, M. S. (2023). Generative Agents: Interactive Simulacra of Human Behavior.
+[https://arxiv.org/abs/2304.03442]
+
+Author: Donny Sanders
+"""
+from heapq import nsmallest
+
+class LocationNode:
+    """
+    A node in the location tree (the world, an area or a room).
+    """
+    def __init__(self, name, parent=None):
+        """
+        name: name of the location.
+        parent: enclosing LocationNode, or None for the root.
+        """
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.objects = []
+
+    def path(self):
+        """
+        Returns the names of the locations from the top-level area down to this node.
+        """
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return tuple(reversed(names))
+
+    def all_objects(self):
+        """
+        Returns the objects in this location and every location inside it.
+        """
+        objects = list(self.objects)
+        for child in self.children.values():
+            objects.extend(child.all_objects())
+        return objects
+
+class LocationIndex:
+    """
+    Index over the environment's objects supporting location tree lookups and nearest-object queries.
+    """
+    def __init__(self, objects=(), bucket_size=8):
+        """
+        Initializes the index.
+        objects: objects to add, each with a name, type, location path and x, y position.
+        bucket_size: width of the spatial hash buckets, in tiles.
+        """
+        assert bucket_size > 0, "Bucket size must be greater than 0."
+
+        self.root = LocationNode("world")
+        self.bucket_size = bucket_size
+
+        # lowercase name -> locations and objects with that name
+        self.names = {}
+        # type -> {(bucket_x, bucket_y): [objects]}
+        self.buckets = {}
+
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj):
+        """
+        Adds an object to the location tree, name lookup and spatial hash.
+        """
+        node = self.root
+        for name in obj.location:
+            child = node.children.get(name)
+            if child is None:
+                child = node.children[name] = LocationNode(name, node)
+                self.names.setdefault(name.lower(), []).append(child)
+            node = child
+        node.objects.append(obj)
+
+        if obj.name is not None:
+            self.names.setdefault(obj.name.lower(), []).append(obj)
+
+        bucket = self.bucket(obj.x, obj.y)
+        self.buckets.setdefault(obj.type, {}).setdefault(bucket, []).append(obj)
+
+    def get(self, path):
+        """
+        Returns the location at the given path, e.g. "Hobbs Cafe:kitchen", or None if it doesn't exist.
+        """
+        node = self.root
+        for name in path.split(":"):
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def find(self, name):
+        """
+        Returns every location and object with the given name (case-insensitive).
+        """
+        return list(self.names.get(name.lower(), []))
+
+    def nearest(self, position, type, k=1):
+        """
+        Returns up to k objects of the given type closest to the position, nearest first.
+        position: (x, y) tile coordinates, which may be fractional.
+        The occupied buckets are grouped into rings by their Chebyshev distance from the position's bucket and
+        searched ring by ring, skipping empty rings and stopping once no unsearched ring can contain an object
+        closer than the k-th nearest found.
+        """
+        buckets = self.buckets.get(type)
+        if not buckets or k <= 0:
+            return []
+
+        x, y = position
+        center_x, center_y = self.bucket(x, y)
+
+        # ring -> object lists of the occupied buckets in it
+        rings = {}
+        for (bx, by), objects in buckets.items():
+            rings.setdefault(max(abs(bx - center_x), abs(by - center_y)), []).append(objects)
+        occupied = sorted(rings)
+
+        def distance(obj):
+            return (obj.x - x) ** 2 + (obj.y - y) ** 2
+
+        candidates = []
+        for i, ring in enumerate(occupied):
+            for objects in rings[ring]:
+                candidates.extend(objects)
+
+            if len(candidates) >= k and i + 1 < len(occupied):
+                closest = nsmallest(k, candidates, key=distance)
+                # Objects in ring r are at least (r - 1) * bucket_size tiles away along one axis
+                if distance(closest[-1]) <= ((occupied[i + 1] - 1) * self.bucket_size) ** 2:
+                    return closest
+
+        return nsmallest(k, candidates, key=distance)
+
+    def bucket(self, x, y):
+        """
+        Returns the coordinates of the spatial hash bucket containing the (possibly fractional) position.
+        """
+        return int(x // self.bucket_size), int(y // self.bucket_size)
@@ -10,11 +10,14 @@ class Object:
     Base class for all objects in the simulation.
     """
 
-    def __init__(self, x, y, texture=None):
+    def __init__(self, x, y, texture=None, name=None, type=None, location=()):
         """
         Initializes the game object.
         x, y: position of the object.
         texture: path to image file to use as texture.
+        name: name of the object (e.g. "Roberto's bed").
+        type: kind of object used for environment queries (e.g. "bed").
+        location: path of the area and room containing the object (e.g. ("Roberto's house", "bedroom")).
         """
         assert isinstance(x, int) and isinstance(y, int), "Object coordinates must be integers."
         if texture is not None:
@@ -23,12 +26,16 @@ class Object:
 
         self.x = x
         self.y = y
+        self.name = name
+        self.type = type
+        self.location = tuple(location)
         self.texture = pygame.image.load(texture) if texture is not None else None
 
-    def draw(self, surface, size):
+    def draw(self, surface, size, alpha=1.0):
         """
         Draws the game object to the given surface.
         size: size of the object.
+        alpha: interpolation factor between simulation ticks. Objects don't move, so it is unused.
         """
         if self.texture is not None:
             # Scale the texture to the object's size and draw it
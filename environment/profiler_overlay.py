@@ -0,0 +1,59 @@
+"""
+Module containing the on-screen overlay for the profiler.
+
+Author: Donny Sanders
+"""
+import pygame
+
+class ProfilerOverlay:
+    """
+    Draws the profiler's rolling histogram stats in the corner of the screen.
+    """
+    def __init__(self, profiler, font_size=16, refresh_interval=0.5):
+        """
+        Initializes the overlay.
+        profiler: Profiler whose stats are shown.
+        font_size: size of the overlay text.
+        refresh_interval: seconds between re-rendering the text, so the overlay stays cheap to draw.
+        """
+        self.profiler = profiler
+        self.visible = False
+        self.refresh_interval = refresh_interval
+        self.font = pygame.font.SysFont("monospace", font_size)
+        self.rendered = []
+        self.last_refresh = 0
+
+    def toggle(self):
+        """
+        Shows or hides the overlay.
+        """
+        self.visible = not self.visible
+
+    def refresh(self):
+        """
+        Re-renders the stats text.
+        """
+        lines = [f"{'name':<28}{'n':>8}{'mean':>9}{'p95':>9}{'max':>9}"]
+        for name, stats in self.profiler.stats().items():
+            lines.append(f"{name:<28}{stats['count']:>8}{stats['mean']:>9.2f}{stats['p95']:>9.2f}{stats['max']:>9.2f}")
+        self.rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+
+    def draw(self, surface, now):
+        """
+        Draws the overlay to the given surface.
+        now: current time in seconds, used to throttle re-rendering.
+        """
+        if not self.visible:
+            return
+
+        if now - self.last_refresh >= self.refresh_interval:
+            self.refresh()
+            self.last_refresh = now
+
+        line_height = self.font.get_linesize()
+        width = max((line.get_width() for line in self.rendered), default=0)
+        background = pygame.Surface((width + 8, line_height * len(self.rendered) + 8), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 180))
+        surface.blit(background, (0, 0))
+        for i, line in enumerate(self.rendered):
+            surface.blit(line, (4, 4 + i * line_height))
@@ -5,9 +5,13 @@ Author: Donny Sanders
 """
 import time
 import pygame
-from agents.agent import Agent
+from core.agent import Agent
+from environment.location_index import LocationIndex
+from environment.profiler_overlay import ProfilerOverlay
 
+from util.frame_limiter import FrameLimiter
 from util.json_parser import JsonParser
+from util.profiler import profiler
 
 class Simulation:
     """
@@ -15,11 +19,18 @@ class Simulation:
     Contains grid and handles main simulation loop.
     """
     debugval = False
-    def __init__(self, width, height, screen):
+    # Longest frame time fed into the simulation, so a stall doesn't trigger a burst of catch-up ticks
+    MAX_FRAME_TIME = 0.25
+
+    def __init__(self, width, height, screen, trace_path="trace.json", tick_rate=20, max_fps=60):
         """
         Initializes the simulation.
         width, height: dimensions of the simulation.
         screen: pygame surface for drawing the simulation.
+        trace_path: file the profiler's Chrome trace is exported to (F4, or on exit while profiling).
+        tick_rate: simulation ticks per second. The simulation always advances in fixed ticks, so outcomes
+                   don't depend on the frame rate.
+        max_fps: frame rate cap for rendering, or 0 to run uncapped.
         """
         assert width > 0 and height > 0, "Simulation dimensions must be greater than 0."
 
@@ -30,10 +41,23 @@ class Simulation:
         self.grid = JsonParser.loadGrid(100, width, height)
         self.screen = screen
 
+        # Objects are indexed by location and type so planning and perception can look them up. They have no
+        # textures yet and the tiles already show the furniture, so they are not drawn.
+        self.objects = JsonParser.loadObjects(self.grid)
+        self.location_index = LocationIndex(self.objects)
+
         roberto_filipe = Agent(3, 5, "Roberto Filipe", self.grid)
         self.agents.append(roberto_filipe)
         self.drawables.append(roberto_filipe)
         
+        self.profiler_overlay = ProfilerOverlay(profiler)
+        self.trace_path = trace_path
+
+        self.tick_time = 1 / tick_rate
+        # Elapsed time not yet consumed by a tick
+        self.accumulator = 0.0
+        self.frame_limiter = FrameLimiter(max_fps)
+
         self.running = True
 
     def handle_events(self):
@@ -43,49 +67,83 @@ class Simulation:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.profiler_overlay.toggle()
+                elif event.key == pygame.K_F4:
+                    profiler.export_chrome_trace(self.trace_path)
 
-    def update(self):
+    def update(self, dt):
         """
-        Updates the simulation state.
+        Advances the simulation state by one tick.
+        dt: length of the tick in seconds.
         """
-        dt = time.time() - self.last_update
-        self.last_update = time.time()
-        # for agent in self.agents:
-            # agent.update(dt)
+        for agent in self.agents:
+            agent.update(dt)
+        self.resolve_agents(dt)
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         """
         Draws the simulation.
+        alpha: fraction of the way from the previous tick to the current one, used to interpolate movement.
         """
         self.grid.draw(self.screen)
         for drawable in self.drawables:
-            drawable.draw(self.screen, self.grid.grid_size)
+            drawable.draw(self.screen, self.grid.grid_size, alpha)
+        self.profiler_overlay.draw(self.screen, time.time())
+
+    def step(self, frame_time):
+        """
+        Runs one iteration of the main loop: handles input, advances the simulation by however many
+        fixed ticks fit in the elapsed time, and draws the frame.
+        frame_time: seconds elapsed since the previous frame.
+        """
+        with profiler.span("frame"):
+            with profiler.span("frame.events"):
+                self.handle_events()
+                self.invertBool()
+            with profiler.span("frame.update"):
+                self.accumulator += min(frame_time, self.MAX_FRAME_TIME)
+                while self.accumulator >= self.tick_time:
+                    self.update(self.tick_time)
+                    self.accumulator -= self.tick_time
+            with profiler.span("frame.draw"):
+                self.draw(self.accumulator / self.tick_time)
+            with profiler.span("frame.flip"):
+                pygame.display.flip()
 
     def run(self):
         """
         Runs the main loop of the simulation.
         """
-        self.last_update = time.time()
+        frame_time = 0.0
         while self.running:
-            self.handle_events()
-            self.invertBool()
-            self.update()
-            self.draw()
-            pygame.display.flip()
+            self.step(frame_time)
+            with profiler.span("frame.sleep"):
+                frame_time = self.frame_limiter.wait()
+
+        if profiler.enabled:
+            profiler.export_chrome_trace(self.trace_path)
 
-    def resolve_agents(self):
+    def resolve_agents(self, dt):
         """
         Resolves all agent based interactions.
+        dt: length of the tick in seconds.
         """
         for agent in self.agents:
-            agent.state.execute(agent)
+            agent.state.execute(agent, dt)
     def invertBool(self):
         """
         Inverts debug boolean
         """
         keys = pygame.key.get_pressed()
         if keys[pygame.K_DELETE]:
+            self.debugval = True
             self.debug()
+        elif self.debugval:
+            # Stop the debug agent once the user lets go of it
+            self.debugval = False
+            self.agents[0].move(0, 0)
         
     def debug(self):
         """
@@ -94,15 +152,10 @@ class Simulation:
         keys = pygame.key.get_pressed()
         assert self.agents.count != 0
         debugAgent = self.agents[0]
-        if keys[pygame.K_LEFT]:
-            print("moving left")
-            debugAgent.move(-0.1,0)
-        if keys[pygame.K_RIGHT]:
-            debugAgent.move(0.1,0)
-        if keys[pygame.K_UP]:
-            debugAgent.move(0,-0.1)
-        if keys[pygame.K_DOWN]:
-            debugAgent.move(0,0.1)
+        dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        # Horizontal input takes precedence, as agents can't move diagonally
+        debugAgent.move(dx, 0 if dx != 0 else dy)
             
             
         
\ No newline at end of file
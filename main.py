@@ -8,11 +8,13 @@ import pygame
 import sys
 from environment.simulation import Simulation
 from util.json_parser import JsonParser
+from util.profiler import profiler
 
 def main():
     pygame.init()
 
-    width, height, fullscreen = load_settings()
+    width, height, fullscreen, profiling, trace_path, tick_rate, max_fps = load_settings()
+    profiler.enabled = profiling
     
     if fullscreen:
         screen = pygame.display.set_mode((width, height), pygame.FULLSCREEN)
@@ -20,7 +22,7 @@ def main():
         screen = pygame.display.set_mode((width, height))
 
     # Start the simulation
-    env = Simulation(width, height, screen)
+    env = Simulation(width, height, screen, trace_path, tick_rate, max_fps)
     env.run()
 
     # Quit Pygame when the game loop in the environment is done
@@ -32,8 +34,12 @@ def load_settings():
     width = settings['window_width']
     height = settings['window_height']
     fullscreen = settings['fullscreen']
+    profiling = settings.get('profiling', False)
+    trace_path = settings.get('trace_path', "trace.json")
+    tick_rate = settings.get('tick_rate', 20)
+    max_fps = settings.get('max_fps', 60)
 
-    return width, height, fullscreen
+    return width, height, fullscreen, profiling, trace_path, tick_rate, max_fps
     
 
 if __name__ == "__main__":
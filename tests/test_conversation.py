@@ -0,0 +1,34 @@
+"""
+Tests for conversations between agents.
+
+Author: Donny Sanders
+"""
+from core.agent import Agent
+from core.conversation import ConversationScheduler
+from core.language_model import LanguageModel
+from environment.grid import Grid
+
+class EchoLanguageModel(LanguageModel):
+    """
+    Replies with the same line to every prompt.
+    """
+    def complete(self, prompt):
+        return "Nice weather today."
+
+def test_same_named_participants_keep_separate_contexts():
+    grid = Grid(1, 4, 4)
+    first = Agent(0, 0, "Roberto Filipe", grid)
+    second = Agent(100, 0, "Roberto Filipe", grid)
+    first.memory_stream.store_experience({"description": "the cafe opens early on weekends", "created": 0})
+    second.memory_stream.store_experience({"description": "the library is closed on mondays", "created": 0})
+
+    scheduler = ConversationScheduler(EchoLanguageModel(), context_size=5)
+    conversation = scheduler.start_conversation([first, second], "the weekend", max_turns=4)
+    for _ in range(3):
+        scheduler.tick(now=60)
+
+    assert set(conversation.contexts) == {first, second}
+    first_memories = [m["description"] for m in conversation.contexts[first].memories]
+    second_memories = [m["description"] for m in conversation.contexts[second].memories]
+    assert first_memories == ["the cafe opens early on weekends"]
+    assert second_memories == ["the library is closed on mondays"]
@@ -0,0 +1,62 @@
+"""
+Tests for the cooperative batch path planner.
+
+Author: Donny Sanders
+"""
+import random
+import pytest
+from environment.grid import Grid, Tile
+from util.cooperative_pathfinder import CooperativePathfinder
+
+def build_grid(width, height, rng, obstacle_ratio=0.25):
+    """
+    Builds a Grid in board coordinates (grid[x][y]) with randomly placed unwalkable tiles.
+    """
+    grid = Grid(1, width, height)
+    grid.grid = [[Tile(x, y, 0, rng.random() >= obstacle_ratio) for y in range(height)] for x in range(width)]
+    return grid
+
+def assert_valid(planner, requests, paths):
+    assert not planner.find_conflicts(paths)
+    for agent_id, path in paths.items():
+        assert len(path) == planner.window + 1
+        assert path[0] == requests[agent_id][0]
+        for a, b in zip(path, path[1:]):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) <= 1
+
+def test_corridor_agents_do_not_swap_or_overlap():
+    grid = Grid(1, 5, 1)
+    grid.grid = [[Tile(x, 0, 0)] for x in range(5)]
+    requests = {0: ((0, 0), (4, 0)), 1: ((4, 0), (0, 0))}
+
+    planner = CooperativePathfinder(grid)
+    assert_valid(planner, requests, planner.plan_batch(requests))
+
+@pytest.mark.parametrize("seed", range(50))
+def test_crowded_maps_are_collision_free(seed):
+    rng = random.Random(seed)
+    grid = build_grid(24, 24, rng)
+    walkable = [(x, y) for x in range(24) for y in range(24) if grid.get(x, y).walkable]
+    requests = {i: (start, rng.choice(walkable)) for i, start in enumerate(rng.sample(walkable, 30))}
+
+    planner = CooperativePathfinder(grid)
+    assert_valid(planner, requests, planner.plan_batch(requests))
+
+def test_unobstructed_agent_reaches_goal():
+    grid = build_grid(8, 8, random.Random(0), obstacle_ratio=0)
+    planner = CooperativePathfinder(grid)
+    path = planner.plan_batch({0: ((0, 0), (3, 4))})[0]
+    assert path[7] == (3, 4) and path[-1] == (3, 4)
+
+def test_find_conflicts_reports_swaps_and_shared_cells():
+    swap = {0: [(0, 0), (1, 0)], 1: [(1, 0), (0, 0)]}
+    shared = {0: [(0, 0), (1, 0)], 1: [(2, 0), (1, 0)]}
+    assert CooperativePathfinder.find_conflicts(swap)
+    assert CooperativePathfinder.find_conflicts(shared)
+
+def test_distance_maps_are_capped():
+    grid = build_grid(8, 8, random.Random(0), obstacle_ratio=0)
+    planner = CooperativePathfinder(grid, max_cached_goals=3)
+    for goal in [(0, 0), (1, 0), (2, 0), (0, 0), (3, 0)]:
+        planner.distance_map(goal)
+    assert list(planner.distance_maps) == [(2, 0), (0, 0), (3, 0)]
@@ -0,0 +1,44 @@
+"""
+Tests for the location index.
+
+Author: Donny Sanders
+"""
+import random
+import pytest
+from environment.location_index import LocationIndex
+from environment.object import Object
+
+def brute_force_nearest(objects, position, type, k):
+    x, y = position
+    matching = [obj for obj in objects if obj.type == type]
+    return sorted(matching, key=lambda obj: (obj.x - x) ** 2 + (obj.y - y) ** 2)[:k]
+
+def distances(objects, position):
+    return [(obj.x - position[0]) ** 2 + (obj.y - position[1]) ** 2 for obj in objects]
+
+@pytest.mark.parametrize("count", [3, 50, 2000])
+def test_nearest_matches_brute_force(count):
+    rng = random.Random(count)
+    types = ["bed", "stove", "table"]
+    objects = [Object(rng.randrange(200), rng.randrange(200), None, f"object {i}", rng.choice(types), ("area",))
+               for i in range(count)]
+    index = LocationIndex(objects)
+
+    for _ in range(100):
+        # Agents are between tiles while walking, so positions may be fractional
+        position = (rng.uniform(-20, 220), rng.uniform(-20, 220))
+        k = rng.randint(1, 6)
+        expected = brute_force_nearest(objects, position, "stove", k)
+        assert distances(index.nearest(position, "stove", k), position) == distances(expected, position)
+
+def test_nearest_unknown_type_is_empty():
+    index = LocationIndex([Object(1, 1, None, "bed", "bed", ("house",))])
+    assert index.nearest((0.5, 0.5), "stove", 3) == []
+
+def test_location_lookups():
+    bed = Object(1, 1, None, "Bed", "bed", ("House", "bedroom"))
+    index = LocationIndex([bed])
+    assert index.get("House:bedroom").objects == [bed]
+    assert index.get("House:kitchen") is None
+    assert index.find("bed") == [bed]
+    assert index.get("House:bedroom").path() == ("House", "bedroom")
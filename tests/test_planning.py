@@ -0,0 +1,47 @@
+"""
+Tests for plan decomposition and revision.
+
+Author: Donny Sanders
+"""
+from core.language_model import LanguageModel
+from core.planning import Planning, PlanNode
+
+class HourlyLanguageModel(LanguageModel):
+    """
+    Splits every block it is asked to decompose into hour-long steps from 08:00. Tests use level 1 blocks,
+    so the steps are not decomposed further.
+    """
+    def complete(self, prompt):
+        return "\n".join(f"{hour:02d}:00 60 step {hour}" for hour in range(8, 12))
+
+def test_trimmed_block_reuses_template_of_original_block():
+    language_model = HourlyLanguageModel()
+    planning = Planning(language_model)
+    # Yesterday's identical block caches the template
+    planning.decompose(PlanNode("work at the cafe", 8 * 60, 240, 1))
+    planning.action_plans = [PlanNode("work at the cafe", 8 * 60, 240, 1)]
+    assert language_model.calls == 1
+
+    # The new plan cuts the undecomposed block in two; both pieces are cut from the cached template
+    planning.change_plan({"description": "help a neighbour move", "start": 9 * 60 + 30, "duration": 60})
+    before, after = planning.action_plans[0], planning.action_plans[2]
+    planning.implement_plan(before.start)
+    planning.implement_plan(after.start)
+
+    assert language_model.calls == 1
+    assert [(child.start, child.duration, child.description) for child in before.children] == [
+        (8 * 60, 60, "step 8"), (9 * 60, 30, "step 9")]
+    assert [(child.start, child.duration, child.description) for child in after.children] == [
+        (10 * 60 + 30, 30, "step 10"), (11 * 60, 60, "step 11")]
+
+def test_trimmed_block_without_cache_is_decomposed_over_its_own_interval():
+    language_model = HourlyLanguageModel()
+    planning = Planning(language_model, cache_templates=False)
+    planning.action_plans = [PlanNode("work at the cafe", 8 * 60, 240, 1)]
+
+    planning.change_plan({"description": "help a neighbour move", "start": 10 * 60, "duration": 120})
+    node = planning.action_plans[0]
+    planning.implement_plan(node.start)
+
+    assert language_model.calls == 1
+    assert [(child.start, child.duration) for child in node.children] == [(8 * 60, 60), (9 * 60, 60)]
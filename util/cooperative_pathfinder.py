@@ -0,0 +1,226 @@
+"""
+Module containing a cooperative (windowed hierarchical) A* planner for batches of agents.
+
+All agents' path requests for a tick are planned one after another in a shared space-time reservation table,
+so later agents route around (or wait for) earlier ones instead of overlapping in doorways. Each search only
+looks a bounded number of steps ahead, keeping the per-tick cost predictable; agents replan as they consume
+their window. The heuristic is the true walking distance to the goal, computed once per goal by a breadth-first
+search and shared by every request (in this and later batches) heading to the same goal.
+
+Silver, D. (2005). Cooperative Pathfinding. AIIDE.
+
+Author: Donny Sanders
+"""
+from collections import OrderedDict, deque
+from heapq import heappop, heappush
+from util.pathfinder import Pathfinder
+from util.profiler import profiler
+
+class CooperativePathfinder:
+    """
+    Plans collision-free paths for many agents at once using a space-time reservation table.
+    """
+    def __init__(self, grid, window=16, max_expansions=None, max_cached_goals=64):
+        """
+        Initialize the planner with a grid.
+        grid: Grid object
+        window: number of time steps each search looks ahead.
+        max_expansions: node budget of a single agent's search, defaults to 16 nodes per window step.
+        max_cached_goals: number of distance maps kept; the least recently used is evicted beyond that.
+        """
+        assert max_cached_goals > 0, "Max cached goals must be greater than 0."
+        assert window > 0, "Window must be greater than 0."
+
+        self.pathfinder = Pathfinder(grid)
+        self.window = window
+        self.max_expansions = max_expansions if max_expansions is not None else window * 16
+
+        # goal -> {cell: walking distance to goal}, reused between requests and batches, in least recently used order
+        self.distance_maps = OrderedDict()
+        self.max_cached_goals = max_cached_goals
+
+        # (x, y, t) -> agent id occupying the cell at time step t
+        self.reservations = {}
+        # (from, to, t) -> agent id moving from one cell to another between t and t + 1
+        self.edge_reservations = {}
+
+    def distance_map(self, goal):
+        """
+        Returns the walking distance from every reachable cell to the goal, computing it on first use.
+        """
+        distances = self.distance_maps.get(goal)
+        if distances is not None:
+            self.distance_maps.move_to_end(goal)
+            return distances
+
+        distances = {goal: 0}
+        frontier = deque([goal])
+        while frontier:
+            current = frontier.popleft()
+            for neighbor in self.pathfinder.get_neighbors(current):
+                if neighbor not in distances:
+                    distances[neighbor] = distances[current] + 1
+                    frontier.append(neighbor)
+
+        self.distance_maps[goal] = distances
+        if len(self.distance_maps) > self.max_cached_goals:
+            self.distance_maps.popitem(last=False)
+        return distances
+
+    def clear_cache(self):
+        """
+        Discards cached distance maps. Call this when tiles change walkability.
+        """
+        self.distance_maps.clear()
+
+    def plan_batch(self, requests):
+        """
+        Plans paths for all agents' requests of a tick.
+        requests: dictionary mapping agent ids to (start, goal) tuples of (x, y) coordinates. Agents are planned
+                  in iteration order, so earlier agents have priority.
+        Returns a dictionary mapping agent ids to paths. A path lists the agent's cell at each of the window + 1
+        time steps, starting with the start cell; agents should request a new batch before they run out of path.
+        No two paths share a cell at the same time step or swap cells between two steps.
+        """
+        assert len({start for start, _ in requests.values()}) == len(requests), "Agents must start in different cells."
+
+        with profiler.span("cooperative_pathfinder.plan_batch", requests=len(requests)) as span:
+            self.reservations.clear()
+            self.edge_reservations.clear()
+
+            # Agents not planned yet hold their start cell for the whole window, so waiting in place is
+            # always a collision-free fallback for them
+            for agent_id, (start, _) in requests.items():
+                self.reserve(agent_id, [start] * (self.window + 1))
+
+            paths = {}
+            expanded = 0
+            for agent_id, (start, goal) in requests.items():
+                path, nodes = self.plan(agent_id, start, goal)
+                self.release(agent_id, [start] * (self.window + 1))
+                self.reserve(agent_id, path)
+                paths[agent_id] = path
+                expanded += nodes
+
+            span.set(nodes_expanded=expanded)
+        profiler.record("cooperative_pathfinder.nodes_expanded", expanded)
+        return paths
+
+    def plan(self, agent_id, start, goal):
+        """
+        Runs a space-time A* search for a single agent against the current reservations.
+        Returns the path and the number of nodes expanded. If the goal is unreachable or every move is
+        blocked, the agent waits in place. If the search runs out of budget, the path ends at the node closest
+        to the goal that the agent can hold for the rest of the window.
+        """
+        distances = self.distance_map(goal)
+        if start not in distances:
+            return [start] * (self.window + 1), 0
+
+        expanded = 0
+        # Ties on f are broken towards later time steps so the search dives along the shared distance map
+        open_set = [(distances[start], 0, start)]
+        came_from = {(start, 0): None}
+
+        while open_set:
+            _, t, current = heappop(open_set)
+            t = -t
+            expanded += 1
+
+            # Stop at the goal once it can be held for the rest of the window, or at the window's edge
+            if (current == goal and self.is_free_until_window(goal, t, agent_id)) or t == self.window:
+                path = self.reconstruct_path(came_from, (current, t))
+                path.extend([current] * (self.window - t))
+                return path, expanded
+
+            for neighbor in self.pathfinder.get_neighbors(current) + [current]:
+                node = (neighbor, t + 1)
+                if node in came_from or neighbor not in distances:
+                    continue
+                if not self.can_move(current, neighbor, t, agent_id):
+                    continue
+
+                came_from[node] = (current, t)
+                heappush(open_set, (t + 1 + distances[neighbor], -(t + 1), neighbor))
+
+            if expanded >= self.max_expansions:
+                break
+
+        # Out of budget, or every route is blocked by higher priority agents. The start cell is held by the
+        # agent for the whole window, so there is always at least one node to fall back to.
+        holdable = [node for node in came_from if self.is_free_until_window(node[0], node[1], agent_id)]
+        current, t = min(holdable, key=lambda node: (distances[node[0]], -node[1]))
+        path = self.reconstruct_path(came_from, (current, t))
+        path.extend([current] * (self.window - t))
+        return path, expanded
+
+    def can_move(self, current, neighbor, t, agent_id):
+        """
+        Returns whether the agent may move from current to neighbor between time steps t and t + 1
+        without entering a reserved cell or swapping places with another agent.
+        """
+        occupant = self.reservations.get((neighbor[0], neighbor[1], t + 1), agent_id)
+        if occupant != agent_id:
+            return False
+
+        swapper = self.edge_reservations.get((neighbor, current, t), agent_id)
+        return swapper == agent_id
+
+    def is_free_until_window(self, cell, t, agent_id):
+        """
+        Returns whether no other agent has reserved the cell from time step t to the end of the window.
+        """
+        for step in range(t, self.window + 1):
+            if self.reservations.get((cell[0], cell[1], step), agent_id) != agent_id:
+                return False
+        return True
+
+    def reserve(self, agent_id, path):
+        """
+        Reserves every cell and move along the agent's path.
+        """
+        for t, cell in enumerate(path):
+            self.reservations[(cell[0], cell[1], t)] = agent_id
+            if t + 1 < len(path):
+                self.edge_reservations[(cell, path[t + 1], t)] = agent_id
+
+    def release(self, agent_id, path):
+        """
+        Removes the agent's reservations along the given path.
+        """
+        for t, cell in enumerate(path):
+            if self.reservations.get((cell[0], cell[1], t)) == agent_id:
+                del self.reservations[(cell[0], cell[1], t)]
+            if t + 1 < len(path) and self.edge_reservations.get((cell, path[t + 1], t)) == agent_id:
+                del self.edge_reservations[(cell, path[t + 1], t)]
+
+    @staticmethod
+    def find_conflicts(paths):
+        """
+        Returns the conflicts between paths returned by plan_batch, as (agent, other agent, cell, t) tuples for
+        agents in the same cell at time step t, or swapping cells between t and t + 1.
+        """
+        conflicts = []
+        occupied = {}
+        moves = {}
+        for agent_id, path in paths.items():
+            for t, cell in enumerate(path):
+                other = occupied.setdefault((cell, t), agent_id)
+                if other != agent_id:
+                    conflicts.append((other, agent_id, cell, t))
+                if t + 1 < len(path) and path[t + 1] != cell:
+                    other = moves.get((path[t + 1], cell, t))
+                    if other is not None:
+                        conflicts.append((other, agent_id, cell, t))
+                    moves[(cell, path[t + 1], t)] = agent_id
+        return conflicts
+
+    def reconstruct_path(self, came_from, node):
+        """
+        Reconstruct the path of cells from the start to the given (cell, t) node.
+        """
+        path = []
+        while node is not None:
+            path.append(node[0])
+            node = came_from[node]
+        return path[::-1]
@@ -0,0 +1,47 @@
+"""
+Module containing a frame limiter that caps the render loop's frame rate.
+
+Author: Donny Sanders
+"""
+import time
+
+class FrameLimiter:
+    """
+    Caps the frame rate by sleeping for the remainder of each frame.
+    The OS usually oversleeps by a small amount, so the limiter keeps a running estimate of the oversleep,
+    sleeps for the remaining time minus that estimate, and spins for the final sliver of the frame.
+    """
+    def __init__(self, max_fps):
+        """
+        Initializes the frame limiter.
+        max_fps: maximum frames per second, or 0 to run uncapped.
+        """
+        assert max_fps >= 0, "Max FPS cannot be negative."
+
+        self.frame_time = 1 / max_fps if max_fps > 0 else 0
+        self.oversleep = 0.001
+        self.last_frame = time.perf_counter()
+
+    def wait(self):
+        """
+        Blocks until the current frame's time budget is used up.
+        Returns the seconds elapsed since the previous call.
+        """
+        target = self.last_frame + self.frame_time
+        remaining = target - time.perf_counter()
+
+        if remaining > self.oversleep:
+            requested = remaining - self.oversleep
+            before = time.perf_counter()
+            time.sleep(requested)
+            actual = time.perf_counter() - before
+            # Exponential moving average of how much longer than requested the sleep took
+            self.oversleep = max(0.0, 0.9 * self.oversleep + 0.1 * (actual - requested))
+
+        while time.perf_counter() < target:
+            pass
+
+        now = time.perf_counter()
+        dt = now - self.last_frame
+        self.last_frame = now
+        return dt
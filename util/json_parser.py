@@ -6,6 +6,7 @@ Author: Donny Sanders
 import json
 import os
 import environment.grid as env
+import environment.object
 import core.agent 
 
 class JsonParser:
@@ -28,12 +29,16 @@ class JsonParser:
     Loads a Grid object from a JSON file.
     """
     @staticmethod
-    def loadGrid(grid_size, width, height):
+    def loadGrid(grid_size, width, height, path=None):
         """
         Loads a grid from a JSON file.
         The JSON file should contain a 2D array representing the tile types.
+        path: JSON file to load, defaults to resources/json/grid.json.
         """
-        with open(os.path.join("resources", "json", "grid.json"), 'r') as f:
+        if path is None:
+            path = os.path.join("resources", "json", "grid.json")
+
+        with open(path, 'r') as f:
             raw_grid = json.load(f)
 
         # Determine grid size based on window size
@@ -71,8 +76,33 @@ class JsonParser:
         return agents
 
     @staticmethod
-    def loadObjects(grid):
+    def loadObjects(grid, path=None):
         """
         Loads a list of objects from a JSON file.
+        The JSON file should contain a list of areas, each with a name and a list of rooms, each with a name
+        and a list of objects with a name, type, position and optional texture.
+        path: JSON file to load, defaults to resources/json/objects.json.
         """
-        pass
\ No newline at end of file
+        if path is None:
+            path = os.path.join("resources", "json", "objects.json")
+
+        with open(path, 'r') as f:
+            areas = json.load(f)
+
+        objects = []
+
+        for area in areas:
+            for room in area["rooms"]:
+                for obj in room["objects"]:
+                    x, y = obj["position"]
+                    assert 0 <= x < len(grid.grid[0]) and 0 <= y < len(grid.grid), \
+                        f"Object '{obj['name']}' is outside the grid."
+
+                    curr = environment.object.Object(x, y,
+                                                     obj.get("texture"),
+                                                     obj["name"],
+                                                     obj["type"],
+                                                     (area["name"], room["name"]))
+                    objects.append(curr)
+
+        return objects
\ No newline at end of file
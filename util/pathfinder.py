@@ -4,6 +4,7 @@ Module containing A* pathfinding algorithm.
 Author: Donny Sanders
 """
 from heapq import heappop, heappush
+from util.profiler import profiler
 
 class Pathfinder:
     """
@@ -51,17 +52,29 @@ class Pathfinder:
         Find a path from start to end using A* algorithm.
         start, end: tuples of (x, y) coordinates
         """
+        with profiler.span("pathfinder.find_path") as span:
+            path, expanded = self._search(start, end)
+            span.set(nodes_expanded=expanded, length=len(path))
+        profiler.record("pathfinder.nodes_expanded", expanded)
+        return path
+
+    def _search(self, start, end):
+        """
+        Runs the A* search, returning the path and the number of nodes expanded.
+        """
+        expanded = 0
         open_set = [(0, start)]
-        came_from = {start: None}
+        came_from = {}
         g_score = {start: 0}
         f_score = {start: self.heuristic(start, end)}
 
         # Main A* search loop
         while open_set:
             current = heappop(open_set)[1]
+            expanded += 1
             
             if current == end:
-                return self.reconstruct_path(came_from, current)
+                return self.reconstruct_path(came_from, current), expanded
             
             for neighbor in self.get_neighbors(current):
                 tentative_g_score = g_score[current] + 1
@@ -76,4 +89,4 @@ class Pathfinder:
                     if neighbor not in [i[1] for i in open_set]:
                         heappush(open_set, (f_score[neighbor], neighbor))
 
-        return []  # No path was found
\ No newline at end of file
+        return [], expanded  # No path was found
\ No newline at end of file